@@ -0,0 +1,629 @@
+"""
+Banco de pruebas de carga para Akashia
+Levanta la aplicación bajo gunicorn, siembra el CSV mediante AKASHIA_CSV_PATH y
+reproduce una mezcla de tráfico realista (envíos, análisis detallados, estadísticas
+y exportaciones), reportando throughput, latencias p50/p95/p99 y errores por ruta.
+
+Todo corre en una sola máquina y sin red: el servidor escucha en 127.0.0.1.
+
+Uso:
+    python loadtest.py --seed-rows 500 --duration 30 --concurrency 16
+    python loadtest.py --profile disco:storage=disk --profile shm:storage=tmpfs
+    python loadtest.py --profile sync:workers=4 --profile hilos:workers=2,threads=8
+"""
+
+import argparse
+import csv
+import http.client
+import json
+import math
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from urllib.parse import urlencode
+
+import nltk
+
+from app import FIELDNAMES
+from dream_analyzer import DreamAnalyzer
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LOADTEST_PASSWORD = 'loadtest'
+
+# Mezcla de tráfico por defecto (pesos relativos por ruta)
+DEFAULT_MIX = {
+    'submit': 15,
+    'detail': 45,
+    'analysis': 20,
+    'export_csv': 10,
+    'export_json': 10,
+}
+
+# Ruta lógica -> (método, ruta HTTP, códigos esperados)
+ROUTES = {
+    'home': ('GET', '/', {200}),
+    'submit': ('POST', '/', {302}),
+    'detail': ('GET', '/dream-analysis/{dream_id}', {200}),
+    'analysis': ('GET', '/analysis', {200}),
+    'dashboard': ('GET', '/dashboard', {200}),
+    'export_csv': ('GET', '/export.csv', {200}),
+    'export_json': ('GET', '/export.json', {200}),
+}
+
+DEFAULT_PROFILE = {
+    'workers': 2,
+    'threads': 1,
+    'worker_class': 'sync',
+    'storage': 'disk',
+    'seed_analysis': True,
+}
+
+# Recursos de NLTK que DreamAnalyzer descarga si no están instalados
+NLTK_RESOURCES = [
+    'tokenizers/punkt',
+    'corpora/stopwords',
+    'taggers/averaged_perceptron_tagger',
+]
+# NLTK >= 3.8.2 además carga punkt_tab y averaged_perceptron_tagger_eng
+NLTK_DOWNLOAD_HINT = ('python -m nltk.downloader punkt punkt_tab stopwords '
+                      'averaged_perceptron_tagger averaged_perceptron_tagger_eng')
+SAMPLE_DREAM = 'Soñé que volaba sobre una ciudad azul. Después caía hacia el mar sin miedo.'
+ANALYSIS_ERROR = json.dumps({'error': 'Error en el análisis semántico'})
+
+# Vocabulario para generar relatos de sueños sintéticos
+DREAM_WORDS = [
+    'casa', 'calle', 'montaña', 'mar', 'bosque', 'ciudad', 'playa', 'río', 'escuela',
+    'familia', 'amigo', 'padre', 'madre', 'hermana', 'abuelo', 'extraño', 'profesor',
+    'miedo', 'alegría', 'tristeza', 'paz', 'ansiedad', 'calma', 'esperanza', 'angustia',
+    'correr', 'volar', 'caer', 'nadar', 'caminar', 'gritar', 'huir', 'perseguir', 'buscar',
+    'puerta', 'ventana', 'espejo', 'llave', 'reloj', 'agua', 'fuego', 'cielo', 'noche',
+    'perro', 'gato', 'pájaro', 'serpiente', 'lobo', 'mariposa', 'azul', 'rojo', 'negro',
+    'de', 'la', 'el', 'en', 'con', 'que', 'una', 'un', 'muy', 'sin', 'hacia', 'después',
+]
+DREAM_TYPES = ['normal', 'lucido', 'pesadilla', 'recurrente', 'profetico']
+EMOTIONS = ['alegria', 'miedo', 'tristeza', 'paz', 'ansiedad', 'confusion']
+REGIONS = ['Lima', 'Cusco', 'Arequipa', 'Madrid', 'Bogotá', 'Santiago', 'Ciudad de México']
+
+# Distribución de longitudes del relato: (peso, mínimo, máximo)
+TEXT_LENGTHS = [
+    (50, 50, 200),
+    (35, 200, 1000),
+    (15, 1000, 5000),
+]
+
+
+def sample_text_length(rng):
+    """Elige una longitud de relato según TEXT_LENGTHS"""
+    weights = [w for w, _, _ in TEXT_LENGTHS]
+    _, low, high = rng.choices(TEXT_LENGTHS, weights=weights)[0]
+    return rng.randint(low, high)
+
+
+def build_dream_text(rng, length):
+    """Genera un relato de exactamente `length` caracteres"""
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(DREAM_WORDS)
+        words.append(word)
+        size += len(word) + 1
+    text = ' '.join(words)[:length]
+    # evitar que el recorte deje espacios al final (la app hace strip)
+    return text[:-1] + '.' if text.endswith(' ') else text
+
+
+def make_submission(rng):
+    """Construye los campos de un formulario de envío válido"""
+    person = rng.randint(0, 99999)
+    return {
+        'name': f'Soñante {person}',
+        'email': f'sonante{person}@example.com',
+        'age': str(rng.randint(16, 80)),
+        'region': rng.choice(REGIONS),
+        'dream_type': rng.choice(DREAM_TYPES),
+        'emotion': rng.choice(EMOTIONS),
+        'message': build_dream_text(rng, sample_text_length(rng)),
+    }
+
+
+def missing_nltk_data():
+    """Devuelve los recursos de NLTK que faltan localmente (sin descargar nada)"""
+    missing = []
+    for resource in NLTK_RESOURCES:
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            missing.append(resource)
+    return missing
+
+
+def check_analyzer():
+    """
+    Ejecuta un análisis real sobre un relato de prueba.
+    Devuelve None si funciona o la descripción del error si no.
+    """
+    missing = missing_nltk_data()
+    if missing:
+        # DreamAnalyzer intentaría descargarlos
+        return f"faltan datos de NLTK: {', '.join(missing)}"
+    try:
+        analyzer = DreamAnalyzer()
+        analysis = analyzer.analyze_dream(SAMPLE_DREAM)
+        analyzer.generate_dream_report(analysis)
+    except Exception as e:
+        # los LookupError de NLTK traen un recuadro de asteriscos
+        lines = [line.strip() for line in str(e).splitlines() if line.strip().strip('*')]
+        return f"el análisis de prueba falló: {lines[0] if lines else type(e).__name__}"
+    return None
+
+
+def seed_rows(count, seed=0, analyze=True):
+    """Genera filas para sembrar el CSV, con el análisis que guardaría la app"""
+    rng = random.Random(seed)
+    analyzer = None
+    # sin datos de NLTK el analizador intentaría descargarlos: las filas quedan en error
+    if analyze and not missing_nltk_data():
+        try:
+            analyzer = DreamAnalyzer()
+        except Exception as e:
+            # igual que la app: si el analizador no arranca se guarda el error
+            print(f"Error en análisis: {e}")
+
+    start = datetime(2025, 1, 1)
+    rows = []
+    for i in range(count):
+        row = make_submission(rng)
+        row['timestamp'] = (start + timedelta(minutes=i)).isoformat()
+        row['analysis'] = ANALYSIS_ERROR if analyze else ''
+        if analyzer is not None:
+            try:
+                analysis = analyzer.analyze_dream(
+                    dream_text=row['message'],
+                    dream_type=row['dream_type'],
+                    emotion=row['emotion'],
+                    age=row['age'],
+                    region=row['region']
+                )
+                analysis['report'] = analyzer.generate_dream_report(analysis)
+                row['analysis'] = json.dumps(analysis, ensure_ascii=False)
+            except Exception:
+                # se contabiliza con count_failed_analysis()
+                pass
+        rows.append(row)
+    return rows
+
+
+def count_failed_analysis(rows):
+    """Cuenta las filas cuyo análisis quedó como error"""
+    failed = 0
+    for row in rows:
+        try:
+            if 'error' in json.loads(row['analysis']):
+                failed += 1
+        except (ValueError, TypeError):
+            failed += 1
+    return failed
+
+
+def write_csv(path, rows, with_analysis=True):
+    """Escribe las filas sembradas con el mismo esquema que usa la app"""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+        writer.writeheader()
+        for row in rows:
+            if not with_analysis:
+                row = dict(row, analysis='')
+            writer.writerow(row)
+
+
+def parse_mix(spec):
+    """Convierte 'submit=20,detail=50' en un diccionario de pesos"""
+    mix = {}
+    for part in spec.split(','):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ROUTES:
+            raise ValueError(f"Ruta desconocida en la mezcla: {name}")
+        mix[name] = float(weight)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("La mezcla de tráfico debe tener al menos un peso positivo")
+    return mix
+
+
+def _parse_bool(value):
+    return value.strip().lower() in ('1', 'true', 'yes', 'si', 'sí', 'on')
+
+
+def parse_profile(spec, base=None):
+    """
+    Convierte 'nombre:clave=valor,...' en un perfil de despliegue.
+    Claves: workers, threads, worker_class, storage (disk, tmpfs o un directorio),
+    seed_analysis y env.NOMBRE para variables de entorno adicionales.
+    """
+    name, sep, options = spec.partition(':')
+    if not sep:
+        name, options = spec, ''
+    profile = dict(base or DEFAULT_PROFILE)
+    profile['env'] = dict(profile.get('env', {}))
+    profile['name'] = name.strip()
+    for part in options.split(','):
+        if not part.strip():
+            continue
+        key, _, value = part.partition('=')
+        key = key.strip()
+        if key.startswith('env.'):
+            profile['env'][key[4:]] = value
+        elif key in ('workers', 'threads'):
+            profile[key] = int(value)
+        elif key == 'seed_analysis':
+            profile[key] = _parse_bool(value)
+        elif key in ('worker_class', 'storage'):
+            profile[key] = value.strip()
+        else:
+            raise ValueError(f"Clave de perfil desconocida: {key}")
+    return profile
+
+
+def percentile(sorted_values, pct):
+    """Percentil por rango más cercano sobre una lista ya ordenada"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def effective_worker_class(profile):
+    """Clase de worker que usa gunicorn: con varios hilos 'sync' pasa a 'gthread'"""
+    if profile['worker_class'] == 'sync' and profile['threads'] > 1:
+        return 'gthread'
+    return profile['worker_class']
+
+
+def storage_dir(storage):
+    """Crea el directorio donde vivirá el CSV según el backend elegido"""
+    if storage == 'disk':
+        return tempfile.mkdtemp(prefix='.loadtest-', dir=BASE_DIR)
+    if storage == 'tmpfs':
+        return tempfile.mkdtemp(prefix='akashia-loadtest-', dir='/dev/shm')
+    os.makedirs(storage, exist_ok=True)
+    return tempfile.mkdtemp(prefix='akashia-loadtest-', dir=storage)
+
+
+def free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(profile, csv_path, port, log_file):
+    """Levanta gunicorn con la mezcla de workers/hilos del perfil"""
+    env = os.environ.copy()
+    env.update(profile.get('env', {}))
+    env['AKASHIA_CSV_PATH'] = csv_path
+    env['ADMIN_PASSWORD'] = LOADTEST_PASSWORD
+    env['PYTHONUNBUFFERED'] = '1'
+    env.pop('FLASK_ENV', None)
+    cmd = [
+        sys.executable, '-m', 'gunicorn', 'app:app',
+        '--bind', f'127.0.0.1:{port}',
+        '--workers', str(profile['workers']),
+        '--threads', str(profile['threads']),
+        '--worker-class', profile['worker_class'],
+        '--timeout', '120',
+        '--log-level', 'warning',
+    ]
+    return subprocess.Popen(cmd, cwd=BASE_DIR, env=env, stdout=log_file, stderr=subprocess.STDOUT)
+
+
+def wait_ready(proc, port, timeout=60):
+    """Espera hasta que el servidor responda en /success"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            return False
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            conn.request('GET', '/success')
+            status = conn.getresponse().status
+            conn.close()
+            if status == 200:
+                return True
+        except OSError:
+            pass
+        time.sleep(0.2)
+    return False
+
+
+def stop_server(proc):
+    proc.terminate()
+    try:
+        proc.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def _client(port, mix, seeded_rows, seed, start_at, record_at, end_at, timeout, results, finished, lock):
+    """Cliente en bucle cerrado: emite peticiones hasta end_at"""
+    rng = random.Random(seed)
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    admin = {'X-AKASHIA-ADMIN': LOADTEST_PASSWORD}
+    samples = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+    last_finish = 0.0
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=timeout)
+
+    while time.monotonic() < start_at:
+        time.sleep(0.001)
+
+    while True:
+        now = time.monotonic()
+        if now >= end_at:
+            break
+        name = rng.choices(names, weights=weights)[0]
+        method, path, expected = ROUTES[name]
+        body = None
+        headers = {}
+        if name == 'submit':
+            body = urlencode(make_submission(rng))
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        elif name == 'detail':
+            path = path.format(dream_id=rng.randrange(max(seeded_rows, 1)))
+        elif name.startswith('export'):
+            headers.update(admin)
+
+        ok = False
+        started = time.perf_counter()
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            ok = response.status in expected
+        except (OSError, http.client.HTTPException):
+            conn.close()
+        latency = time.perf_counter() - started
+
+        if now >= record_at:
+            samples[name].append(latency)
+            last_finish = time.monotonic()
+            if not ok:
+                errors[name] += 1
+    conn.close()
+
+    with lock:
+        for name in names:
+            results[name]['latencies'].extend(samples[name])
+            results[name]['errors'] += errors[name]
+        finished.append(last_finish)
+
+
+def run_load(port, mix, seeded_rows, concurrency, duration, warmup=0.0, seed=0, timeout=30):
+    """Ejecuta la carga y devuelve latencias y errores por ruta"""
+    results = {name: {'latencies': [], 'errors': 0} for name in mix}
+    finished = []
+    lock = threading.Lock()
+    start_at = time.monotonic() + 0.1
+    record_at = start_at + warmup
+    end_at = record_at + duration
+    threads = [
+        threading.Thread(
+            target=_client,
+            args=(port, mix, seeded_rows, seed + i, start_at, record_at, end_at, timeout, results, finished, lock),
+            daemon=True,
+        )
+        for i in range(concurrency)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # ventana real: incluye las peticiones que seguían en vuelo al llegar a end_at
+    elapsed = max(finished + [end_at]) - record_at
+    summary = summarize(results, elapsed)
+    summary['total']['elapsed_s'] = round(elapsed, 3)
+    return summary
+
+
+def summarize(results, elapsed):
+    """Calcula throughput, percentiles y tasa de error por ruta y en total"""
+    summary = {}
+    all_latencies = []
+    total_errors = 0
+    for name, data in results.items():
+        latencies = sorted(data['latencies'])
+        all_latencies.extend(latencies)
+        total_errors += data['errors']
+        summary[name] = _route_stats(latencies, data['errors'], elapsed)
+    summary['total'] = _route_stats(sorted(all_latencies), total_errors, elapsed)
+    return summary
+
+
+def _route_stats(latencies, errors, elapsed):
+    count = len(latencies)
+    return {
+        'requests': count,
+        'errors': errors,
+        'error_rate': round(errors / count, 4) if count else 0.0,
+        'rps': round(count / elapsed, 2) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'max_ms': round(latencies[-1] * 1000, 2) if latencies else 0.0,
+    }
+
+
+def run_profile(profile, rows, args):
+    """
+    Siembra un CSV nuevo, levanta el servidor del perfil y lanza la carga.
+    Devuelve el resumen por ruta y cuántos envíos guardaron el análisis en error.
+    """
+    directory = storage_dir(profile['storage'])
+    csv_path = os.path.join(directory, 'submissions.csv')
+    log_path = os.path.join(directory, 'gunicorn.log')
+    write_csv(csv_path, rows, with_analysis=profile['seed_analysis'])
+    port = free_port()
+    try:
+        with open(log_path, 'w', encoding='utf-8') as log_file:
+            proc = start_server(profile, csv_path, port, log_file)
+            try:
+                if not wait_ready(proc, port):
+                    with open(log_path, encoding='utf-8') as f:
+                        log = f.read()[-2000:]
+                    raise RuntimeError(f"El servidor del perfil '{profile['name']}' no arrancó:\n{log}")
+                summary = run_load(
+                    port, args.mix, len(rows), args.concurrency, args.duration,
+                    warmup=args.warmup, seed=args.seed, timeout=args.timeout,
+                )
+            finally:
+                stop_server(proc)
+        # la app responde 302 aunque el análisis falle: revisar lo que guardó
+        with open(csv_path, newline='', encoding='utf-8') as f:
+            submitted = list(csv.DictReader(f))[len(rows):]
+        return summary, count_failed_analysis(submitted)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def print_report(profile, summary, seeded=0, failed=0, submit_failed=0):
+    print(f"\n== Perfil {profile['name']}: workers={profile['workers']} threads={profile['threads']} "
+          f"worker_class={effective_worker_class(profile)} storage={profile['storage']} "
+          f"seed_analysis={profile['seed_analysis']}")
+    if failed:
+        print(f"   AVISO: {failed}/{seeded} filas sembradas tienen el análisis en error")
+    if submit_failed:
+        print(f"   AVISO: {submit_failed} envíos guardaron el análisis en error")
+    print(f"{'ruta':<12} {'req':>7} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'error %':>8}")
+    for name, stats in summary.items():
+        print(f"{name:<12} {stats['requests']:>7} {stats['rps']:>8.2f} {stats['p50_ms']:>9.2f} "
+              f"{stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f} {stats['max_ms']:>9.2f} "
+              f"{stats['error_rate'] * 100:>8.2f}")
+
+
+def print_comparison(runs):
+    """Compara los perfiles ruta por ruta contra el primero (línea base)"""
+    base_name, base = runs[0]['profile']['name'], runs[0]['summary']
+    print(f"\n== Comparación (línea base: {base_name})")
+    print(f"{'ruta':<12} {'perfil':<14} {'req/s':>8} {'Δ req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'Δ p95':>8} {'p99 ms':>9} {'error %':>8}")
+    for route in base:
+        for run in runs:
+            stats = run['summary'][route]
+            ref = base[route]
+            d_rps = _delta(stats['rps'], ref['rps'])
+            d_p95 = _delta(stats['p95_ms'], ref['p95_ms'])
+            print(f"{route:<12} {run['profile']['name']:<14} {stats['rps']:>8.2f} {d_rps:>9} "
+                  f"{stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {d_p95:>8} {stats['p99_ms']:>9.2f} "
+                  f"{stats['error_rate'] * 100:>8.2f}")
+
+
+def _delta(value, reference):
+    if not reference:
+        return '-'
+    return f"{(value - reference) / reference * 100:+.1f}%"
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Pruebas de carga reproducibles para Akashia bajo gunicorn')
+    parser.add_argument('--seed-rows', type=int, default=500, help='Filas sembradas en el CSV antes de cada corrida')
+    parser.add_argument('--seed', type=int, default=42, help='Semilla para datos y tráfico')
+    parser.add_argument('--duration', type=float, default=30.0, help='Segundos medidos por perfil')
+    parser.add_argument('--warmup', type=float, default=5.0, help='Segundos de calentamiento no medidos')
+    parser.add_argument('--concurrency', type=int, default=8, help='Clientes concurrentes')
+    parser.add_argument('--timeout', type=float, default=30.0, help='Timeout por petición en segundos')
+    parser.add_argument('--mix', type=parse_mix, default=dict(DEFAULT_MIX),
+                        help="Pesos por ruta, p. ej. 'submit=15,detail=45,analysis=20,export_csv=10,export_json=10'")
+    parser.add_argument('--workers', type=int, default=DEFAULT_PROFILE['workers'])
+    parser.add_argument('--threads', type=int, default=DEFAULT_PROFILE['threads'])
+    parser.add_argument('--worker-class', default=DEFAULT_PROFILE['worker_class'])
+    parser.add_argument('--storage', default=DEFAULT_PROFILE['storage'],
+                        help="Dónde vive el CSV: 'disk', 'tmpfs' (/dev/shm) o un directorio")
+    parser.add_argument('--no-seed-analysis', action='store_true',
+                        help='Sembrar filas sin el JSON de análisis precalculado')
+    parser.add_argument('--allow-missing-nltk', action='store_true',
+                        help='Continuar aunque el análisis de prueba falle (los análisis quedarán en error)')
+    parser.add_argument('--profile', action='append', default=[],
+                        help="Perfil 'nombre:clave=valor,...'; con dos o más se activa la comparación")
+    parser.add_argument('--json', dest='json_path', help='Guardar los resultados en este archivo JSON')
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    base = {
+        'workers': args.workers,
+        'threads': args.threads,
+        'worker_class': args.worker_class,
+        'storage': args.storage,
+        'seed_analysis': not args.no_seed_analysis,
+    }
+    try:
+        profiles = [parse_profile(spec, base) for spec in args.profile] or [parse_profile('default', base)]
+    except ValueError as e:
+        parser.error(f"perfil inválido: {e}")
+
+    analyze = any(p['seed_analysis'] for p in profiles)
+
+    if args.seed_rows < 1 and args.mix.get('detail', 0) > 0:
+        parser.error("--seed-rows debe ser al menos 1 cuando la mezcla incluye 'detail'")
+
+    # Si el analizador no funciona, cada envío mediría solo el camino de error
+    # (o descargas fallidas sin red) y las filas sembradas quedarían en error.
+    analysis_error = check_analyzer()
+    analysis_available = analysis_error is None
+    if analysis_error and (analyze or args.mix.get('submit', 0) > 0) and not args.allow_missing_nltk:
+        parser.error(
+            f"{analysis_error}. Instala los datos con '{NLTK_DOWNLOAD_HINT}', "
+            "o quita 'submit' de --mix y usa --no-seed-analysis, o pasa --allow-missing-nltk"
+        )
+
+    print(f"Sembrando {args.seed_rows} sueños (análisis={'sí' if analyze else 'no'})...")
+    rows = seed_rows(args.seed_rows, seed=args.seed, analyze=analyze)
+    failed = count_failed_analysis(rows) if analyze else 0
+    if analysis_error:
+        print(f"AVISO: análisis no disponible, {analysis_error}")
+
+    runs = []
+    for profile in profiles:
+        profile_failed = failed if profile['seed_analysis'] else 0
+        summary, submit_failed = run_profile(profile, rows, args)
+        print_report(profile, summary, seeded=len(rows), failed=profile_failed, submit_failed=submit_failed)
+        runs.append({
+            'profile': dict(profile, worker_class=effective_worker_class(profile)),
+            'seed_analysis_failed': profile_failed,
+            'submit_analysis_failed': submit_failed,
+            'summary': summary,
+        })
+
+    if len(runs) > 1:
+        print_comparison(runs)
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'seed_rows': args.seed_rows,
+                'seed': args.seed,
+                'duration': args.duration,
+                'warmup': args.warmup,
+                'concurrency': args.concurrency,
+                'mix': args.mix,
+                'analysis_available': analysis_available,
+                'analysis_error': analysis_error,
+                'runs': runs,
+            }, f, ensure_ascii=False, indent=2)
+
+    failed_runs = [run for run in runs if run['summary']['total']['errors'] or run['submit_analysis_failed']]
+    return 1 if failed_runs else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
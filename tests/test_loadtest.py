@@ -0,0 +1,130 @@
+import csv
+import json
+import random
+from types import SimpleNamespace
+
+import pytest
+
+import loadtest
+from app import FIELDNAMES
+from loadtest import (
+    ANALYSIS_ERROR, DEFAULT_PROFILE, build_dream_text, check_analyzer, count_failed_analysis,
+    effective_worker_class, make_submission, parse_mix, parse_profile, percentile, run_profile,
+    seed_rows, summarize, write_csv,
+)
+
+
+def test_build_dream_text_length():
+    rng = random.Random(1)
+    for length in (50, 333, 5000):
+        text = build_dream_text(rng, length)
+        assert len(text) == length
+        assert text == text.strip()
+
+
+def test_make_submission_is_valid():
+    rng = random.Random(7)
+    for _ in range(50):
+        data = make_submission(rng)
+        assert data['name'] and data['email']
+        assert 50 <= len(data['message']) <= 5000
+
+
+def test_parse_mix():
+    assert parse_mix('submit=20,detail=80') == {'submit': 20.0, 'detail': 80.0}
+    with pytest.raises(ValueError):
+        parse_mix('unknown=1')
+    with pytest.raises(ValueError):
+        parse_mix('submit=0')
+
+
+def test_parse_profile():
+    profile = parse_profile('shm:storage=tmpfs,threads=4,seed_analysis=no,env.FOO=bar')
+    assert profile['name'] == 'shm'
+    assert profile['storage'] == 'tmpfs'
+    assert profile['threads'] == 4
+    assert profile['workers'] == DEFAULT_PROFILE['workers']
+    assert profile['seed_analysis'] is False
+    assert profile['env'] == {'FOO': 'bar'}
+    with pytest.raises(ValueError):
+        parse_profile('x:bogus=1')
+
+
+def test_percentile_and_summary():
+    values = [i / 1000 for i in range(1, 101)]
+    assert percentile(values, 50) == 0.05
+    assert percentile(values, 99) == 0.099
+    assert percentile([], 95) == 0.0
+
+    summary = summarize({'detail': {'latencies': values, 'errors': 2}}, elapsed=10)
+    assert summary['detail']['rps'] == 10.0
+    assert summary['detail']['error_rate'] == 0.02
+    assert summary['total']['requests'] == 100
+
+
+def test_write_csv_uses_app_schema(tmp_path):
+    path = tmp_path / 'seed.csv'
+    row = dict(make_submission(random.Random(3)), timestamp='2025-01-01T00:00:00', analysis='{}')
+    write_csv(path, [row], with_analysis=False)
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        assert reader.fieldnames == FIELDNAMES
+        rows = list(reader)
+    assert rows[0]['analysis'] == ''
+    assert rows[0]['message'] == row['message']
+
+
+def test_count_failed_analysis():
+    rows = [{'analysis': ANALYSIS_ERROR}, {'analysis': json.dumps({'sentiment': {}})}, {'analysis': ''}]
+    assert count_failed_analysis(rows) == 2
+
+
+def test_main_rejects_detail_without_seed_rows():
+    with pytest.raises(SystemExit) as exc:
+        loadtest.main(['--seed-rows', '0'])
+    assert exc.value.code == 2
+
+
+def test_main_aborts_when_analyzer_fails(monkeypatch):
+    monkeypatch.setattr(loadtest, 'check_analyzer', lambda: 'faltan datos de NLTK: tokenizers/punkt_tab')
+    with pytest.raises(SystemExit) as exc:
+        loadtest.main(['--seed-rows', '5'])
+    assert exc.value.code == 2
+
+
+@pytest.mark.parametrize('spec', ['x:bogus=1', 'x:workers=abc'])
+def test_main_rejects_invalid_profile(spec):
+    with pytest.raises(SystemExit) as exc:
+        loadtest.main(['--profile', spec])
+    assert exc.value.code == 2
+
+
+def test_effective_worker_class():
+    assert effective_worker_class(parse_profile('a')) == 'sync'
+    assert effective_worker_class(parse_profile('b:threads=4')) == 'gthread'
+    assert effective_worker_class(parse_profile('c:threads=4,worker_class=gevent')) == 'gevent'
+
+
+def test_run_profile_smoke(tmp_path):
+    pytest.importorskip('gunicorn')
+    profile = parse_profile(f'smoke:storage={tmp_path},seed_analysis=no')
+    args = SimpleNamespace(
+        mix={'detail': 1, 'analysis': 1}, concurrency=2, duration=0.5,
+        warmup=0, seed=1, timeout=30,
+    )
+    summary, submit_failed = run_profile(profile, seed_rows(5, seed=1, analyze=False), args)
+    assert submit_failed == 0
+    assert summary['total']['elapsed_s'] >= 0.5
+    for route in ('detail', 'analysis', 'total'):
+        assert summary[route]['requests'] > 0
+        assert summary[route]['errors'] == 0
+
+
+def test_check_analyzer_runs_real_analysis(monkeypatch):
+    class BrokenAnalyzer:
+        def analyze_dream(self, text):
+            raise LookupError('\n' + '*' * 70 + '\n  Resource punkt_tab not found.\n' + '*' * 70)
+
+    monkeypatch.setattr(loadtest, 'missing_nltk_data', lambda: [])
+    monkeypatch.setattr(loadtest, 'DreamAnalyzer', BrokenAnalyzer)
+    assert check_analyzer() == 'el análisis de prueba falló: Resource punkt_tab not found.'